@@ -18,40 +18,120 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 from collections import namedtuple
 import functools
 import os
+import sys
 
 import click
 
-from nucypher.cli.types import (
-    EIP55_CHECKSUM_ADDRESS,
-    EXISTING_READABLE_FILE,
-    NETWORK_PORT,
-    )
-from nucypher.network.middleware import RestMiddleware
-from nucypher.utilities.sandbox.middleware import MockRestMiddleware
 
+def _types():
+    from nucypher.cli import types
+    return types
+
+
+#
+# Lazily constructed options (PEP 562)
+#
 
 # Alphabetical
-option_checksum_address = click.option('--checksum-address', help="Run with a specified account", type=EIP55_CHECKSUM_ADDRESS)
-option_config_file = click.option('--config-file', help="Path to configuration file", type=EXISTING_READABLE_FILE)
-option_config_root = click.option('--config-root', help="Custom configuration directory", type=click.Path())
-option_dev = click.option('--dev', '-d', help="Enable development mode", is_flag=True)
-option_db_filepath = click.option('--db-filepath', help="The database filepath to connect to", type=click.STRING)
-option_dry_run = click.option('--dry-run', '-x', help="Execute normally without actually starting the node", is_flag=True)
-option_etherscan = click.option('--etherscan/--no-etherscan', help="Enable/disable viewing TX in Etherscan")
-option_federated_only = click.option('--federated-only', '-F', help="Connect only to federated nodes", is_flag=True, default=None)
-option_force = click.option('--force', help="Don't ask for confirmation", is_flag=True)
-option_geth = click.option('--geth', '-G', help="Run using the built-in geth node", is_flag=True)
-option_hw_wallet = click.option('--hw-wallet/--no-hw-wallet')
-option_light = click.option('--light', help="Indicate that node is light", is_flag=True)
-option_m = click.option('--m', help="M-Threshold KFrags", type=click.INT)
-option_min_stake = click.option('--min-stake', help="The minimum stake the teacher must have to be a teacher", type=click.INT, default=0)
-option_n = click.option('--n', help="N-Total KFrags", type=click.INT)
-option_network = click.option('--network', help="Network Domain Name", type=click.STRING)
-option_poa = click.option('--poa', help="Inject POA middleware", is_flag=True, default=None)
-option_registry_filepath = click.option('--registry-filepath', help="Custom contract registry filepath", type=EXISTING_READABLE_FILE)
-option_staking_address = click.option('--staking-address', help="Address of a NuCypher staker", type=EIP55_CHECKSUM_ADDRESS)
-option_teacher_uri = click.option('--teacher', 'teacher_uri', help="An Ursula URI to start learning from (seednode)", type=click.STRING)
-_option_middleware = click.option('-Z', '--mock-networking', help="Use in-memory transport instead of networking", count=True)
+_OPTION_FACTORIES = {
+    'option_checksum_address': lambda: click.option(
+        '--checksum-address',
+        help="Run with a specified account",
+        type=_types().EIP55_CHECKSUM_ADDRESS),
+    'option_config_file': lambda: click.option(
+        '--config-file',
+        help="Path to configuration file",
+        type=_types().EXISTING_READABLE_FILE),
+    'option_config_root': lambda: click.option(
+        '--config-root',
+        help="Custom configuration directory",
+        type=click.Path()),
+    'option_dev': lambda: click.option(
+        '--dev', '-d',
+        help="Enable development mode",
+        is_flag=True),
+    'option_db_filepath': lambda: click.option(
+        '--db-filepath',
+        help="The database filepath to connect to",
+        type=click.STRING),
+    'option_dry_run': lambda: click.option(
+        '--dry-run', '-x',
+        help="Execute normally without actually starting the node",
+        is_flag=True),
+    'option_etherscan': lambda: click.option(
+        '--etherscan/--no-etherscan',
+        help="Enable/disable viewing TX in Etherscan"),
+    'option_federated_only': lambda: click.option(
+        '--federated-only', '-F',
+        help="Connect only to federated nodes",
+        is_flag=True,
+        default=None),
+    'option_force': lambda: click.option(
+        '--force',
+        help="Don't ask for confirmation",
+        is_flag=True),
+    'option_geth': lambda: click.option(
+        '--geth', '-G',
+        help="Run using the built-in geth node",
+        is_flag=True),
+    'option_hw_wallet': lambda: click.option('--hw-wallet/--no-hw-wallet'),
+    'option_light': lambda: click.option(
+        '--light',
+        help="Indicate that node is light",
+        is_flag=True),
+    'option_m': lambda: click.option(
+        '--m',
+        help="M-Threshold KFrags",
+        type=click.INT),
+    'option_middleware': lambda: wrap_option(process_middleware, mock_networking=_option_middleware()),
+    'option_min_stake': lambda: click.option(
+        '--min-stake',
+        help="The minimum stake the teacher must have to be a teacher",
+        type=click.INT,
+        default=0),
+    'option_n': lambda: click.option(
+        '--n',
+        help="N-Total KFrags",
+        type=click.INT),
+    'option_network': lambda: click.option(
+        '--network',
+        help="Network Domain Name",
+        type=click.STRING),
+    'option_poa': lambda: click.option(
+        '--poa',
+        help="Inject POA middleware",
+        is_flag=True,
+        default=None),
+    'option_registry_filepath': lambda: click.option(
+        '--registry-filepath',
+        help="Custom contract registry filepath",
+        type=_types().EXISTING_READABLE_FILE),
+    'option_staking_address': lambda: click.option(
+        '--staking-address',
+        help="Address of a NuCypher staker",
+        type=_types().EIP55_CHECKSUM_ADDRESS),
+    'option_teacher_uri': lambda: click.option(
+        '--teacher', 'teacher_uri',
+        help="An Ursula URI to start learning from (seednode)",
+        type=click.STRING),
+}
+
+
+def _option_middleware():
+    return click.option(
+        '-Z', '--mock-networking',
+        help="Use in-memory transport instead of networking",
+        count=True)
+
+
+def __getattr__(name):
+    try:
+        factory = _OPTION_FACTORIES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    option = factory()
+    globals()[name] = option
+    return option
 
 
 #
@@ -62,7 +142,7 @@ def option_controller_port(default=None):
     return click.option(
         '--controller-port',
         help="The host port to run Alice HTTP services on",
-        type=NETWORK_PORT,
+        type=_types().NETWORK_PORT,
         default=default)
 
 
@@ -70,7 +150,7 @@ def option_discovery_port(default=None):
     return click.option(
         '--discovery-port',
         help="The host port to run node discovery services on",
-        type=NETWORK_PORT,
+        type=_types().NETWORK_PORT,
         default=default)
 
 
@@ -169,6 +249,9 @@ def wrap_option(handler, **options):
 
 
 def process_middleware(mock_networking):
+    from nucypher.network.middleware import RestMiddleware
+    from nucypher.utilities.sandbox.middleware import MockRestMiddleware
+
     if mock_networking:
         middleware = MockRestMiddleware()
     else:
@@ -177,4 +260,7 @@ def process_middleware(mock_networking):
     return 'middleware', middleware
 
 
-option_middleware = wrap_option(process_middleware, mock_networking=_option_middleware)
+# Module level __getattr__ is only honoured from Python 3.7 onwards
+if sys.version_info < (3, 7):
+    for _name in _OPTION_FACTORIES:
+        __getattr__(_name)
@@ -1,9 +1,13 @@
+import json
 import os
 from unittest import mock
 
+import pytest
+
+from nucypher.cli.commands.alice import ALICE_COMMANDS, alice
 from nucypher.cli.main import nucypher_cli
 from nucypher.config.characters import AliceConfiguration
-from nucypher.config.constants import NUCYPHER_ENVVAR_KEYRING_PASSWORD
+from nucypher.config.constants import NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD, NUCYPHER_ENVVAR_KEYRING_PASSWORD
 from nucypher.utilities.sandbox.constants import (
     INSECURE_DEVELOPMENT_PASSWORD,
     MOCK_IP_ADDRESS,
@@ -13,6 +17,17 @@ from nucypher.utilities.sandbox.constants import (
 from nucypher.cli.actions import SUCCESSFUL_DESTRUCTION
 
 
+def test_alice_help_lists_subcommand_descriptions(click_runner):
+    result = click_runner.invoke(nucypher_cli, ('alice', '--help'), catch_exceptions=False)
+    assert result.exit_code == 0
+
+    for name, (_module, _attribute, short_help) in ALICE_COMMANDS.items():
+        assert name in result.output
+        # The registered short help must stay in sync with the command's own docstring
+        assert alice.get_command(ctx=None, name=name).help.strip() == short_help
+        assert short_help.split()[0] in result.output
+
+
 @mock.patch('nucypher.config.characters.AliceConfiguration.default_filepath', return_value='/non/existent/file')
 def test_missing_configuration_file(default_filepath_mock, click_runner):
     cmd_args = ('alice', 'run')
@@ -163,6 +178,89 @@ def test_alice_view_with_preexisting_configuration(click_runner, custom_filepath
     assert custom_filepath in result.output
 
 
+def test_alice_view_configuration_cache_follows_file_modifications(tmpdir):
+    from nucypher.cli.commands._alice_impl import _read_configuration_file
+
+    filepath = str(tmpdir.join('alice.json'))
+    with open(filepath, 'w') as file:
+        json.dump({'version': AliceConfiguration.VERSION, 'domains': ['first']}, file)
+
+    mtime_ns = os.stat(filepath).st_mtime_ns
+    payload = _read_configuration_file(filepath, mtime_ns)
+    assert payload == {'domains': ['first']}
+    assert _read_configuration_file(filepath, mtime_ns) is payload
+
+    with open(filepath, 'w') as file:
+        json.dump({'version': AliceConfiguration.VERSION, 'domains': ['second']}, file)
+    os.utime(filepath, ns=(mtime_ns + 1, mtime_ns + 1))
+
+    updated_payload = _read_configuration_file(filepath, os.stat(filepath).st_mtime_ns)
+    assert updated_payload == {'domains': ['second']}
+
+
+def test_alice_eth_password_envvar_is_read_once(monkeypatch):
+    from nucypher.cli.commands._alice_impl import _forget_alice_eth_password, _get_alice_eth_password
+
+    monkeypatch.delenv(NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD, raising=False)
+    _forget_alice_eth_password()
+    assert _get_alice_eth_password(default='missing') == 'missing'
+
+    # Setting or removing the envvar changes the environment size, which triggers a re-read
+    monkeypatch.setenv(NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD, 'first')
+    assert _get_alice_eth_password() == 'first'
+
+    # Known limitation: overwriting it in-process goes unnoticed until the cached value is forgotten
+    monkeypatch.setenv(NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD, 'second')
+    assert _get_alice_eth_password() == 'first'
+    _forget_alice_eth_password()
+    assert _get_alice_eth_password() == 'second'
+
+    monkeypatch.delenv(NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD)
+    assert _get_alice_eth_password() is None
+
+
+def test_alice_eth_password_is_read_again_after_failed_unlock(mocker, monkeypatch):
+    from nucypher.blockchain.eth.interfaces import BlockchainInterface
+    from nucypher.cli import actions
+    from nucypher.cli.commands._alice_impl import AliceCharacterOptions
+
+    config = mock.Mock(federated_only=False, dev_mode=False, checksum_address=BlockchainInterface.NULL_ADDRESS)
+    config_options = mock.Mock(**{'create_config.return_value': config})
+    character_options = AliceCharacterOptions(config_options, hw_wallet=False, teacher_uri=None, min_stake=0)
+
+    # Geth rejects the first password while unlocking the account during Alice's construction
+    make_cli_character = mocker.patch.object(actions, 'make_cli_character', side_effect=[ValueError, mock.sentinel.alice])
+
+    monkeypatch.setenv(NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD, 'wrong')
+    with pytest.raises(ValueError):
+        character_options.create_character(emitter=None, config_file=None, json_ipc=True)
+
+    # Overwriting an already set envvar is only noticed because the failure discarded the cached value
+    monkeypatch.setenv(NUCYPHER_ENVVAR_ALICE_ETH_PASSWORD, 'right')
+    assert character_options.create_character(emitter=None, config_file=None, json_ipc=True) is mock.sentinel.alice
+    assert make_cli_character.call_args[1]['client_password'] == 'right'
+
+
+def test_alice_client_password_is_prompted_again_after_failed_unlock(mocker):
+    from nucypher.blockchain.eth.interfaces import BlockchainInterface
+    from nucypher.cli import actions
+    from nucypher.cli.commands._alice_impl import AliceCharacterOptions
+
+    config = mock.Mock(federated_only=False, dev_mode=False, checksum_address=BlockchainInterface.NULL_ADDRESS)
+    config_options = mock.Mock(**{'create_config.return_value': config})
+    character_options = AliceCharacterOptions(config_options, hw_wallet=False, teacher_uri=None, min_stake=0)
+
+    prompt = mocker.patch.object(actions.click, 'prompt', side_effect=['wrong', 'right'])
+    make_cli_character = mocker.patch.object(actions, 'make_cli_character', side_effect=[ValueError, mock.sentinel.alice])
+
+    with pytest.raises(ValueError):
+        character_options.create_character(emitter=None, config_file=None, json_ipc=False)
+
+    assert character_options.create_character(emitter=None, config_file=None, json_ipc=False) is mock.sentinel.alice
+    assert prompt.call_count == 2
+    assert make_cli_character.call_args[1]['client_password'] == 'right'
+
+
 # Should be the last test since it deletes the configuration file
 def test_alice_destroy(click_runner, custom_filepath):
     custom_config_filepath = os.path.join(custom_filepath, AliceConfiguration.generate_filename())
@@ -46,14 +46,14 @@ def test_character_help_messages(click_runner, entry_point_name, entry_point):
     assert result.exit_code == 0
     assert f'{entry_point_name}' in result.output, 'Missing or invalid help text was produced.'
     if isinstance(entry_point, click.Group):
-        for sub_command in entry_point.commands:
+        for sub_command in entry_point.list_commands(ctx=None):
             assert f'{sub_command}' in result.output, f'Sub command {sub_command} is missing from help text'
 
 
 @pytest.mark.parametrize('entry_point_name, entry_point', ([command.name, command] for command in ENTRY_POINTS))
 def test_character_sub_command_help_messages(click_runner, entry_point_name, entry_point):
     if isinstance(entry_point, click.Group):
-        for sub_command in entry_point.commands:
+        for sub_command in entry_point.list_commands(ctx=None):
             result = click_runner.invoke(nucypher_cli,
                                          (entry_point_name, sub_command, '--help'),
                                          catch_exceptions=False)
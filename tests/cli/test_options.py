@@ -0,0 +1,23 @@
+import pytest
+
+from nucypher.cli import options
+
+
+def test_lazy_options_are_constructed_once():
+    first_access = options.option_dev
+    assert options.option_dev is first_access
+
+    from nucypher.cli.options import option_dev
+    assert option_dev is first_access
+
+    # Options are constructed on demand from their factory, then stored on the module
+    assert options.__dict__['option_dev'] is first_access
+
+
+def test_unknown_lazy_option_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        getattr(options, 'option_does_not_exist')
+    assert not hasattr(options, 'option_does_not_exist')
+
+    with pytest.raises(ImportError):
+        from nucypher.cli.options import option_does_not_exist  # noqa: F401